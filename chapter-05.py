@@ -1,12 +1,94 @@
+import argparse
+import array
+import bisect
+import collections
+import concurrent.futures
+import contextlib
 import ctypes
+import heapq
+import itertools
+import math
+import mmap
+import operator
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class GeometricGrowth:
+    """
+    Growth policy multiplying capacity by a constant factor (> 1).
+    """
+
+    def __init__(self, factor=2):
+        if not factor > 1:
+            raise ValueError("growth factor must exceed 1")
+        self._factor = factor
+
+    def __call__(self, capacity, needed):
+        """
+        Return new capacity of at least needed elements.
+        """
+        return max(needed, int(capacity * self._factor))
+
+class AdditiveGrowth:
+    """
+    Growth policy adding a constant number of slots per resize.
+
+    Uses the least memory but makes n appends cost O(n^2 / step).
+    """
+
+    def __init__(self, step=1024):
+        if step < 1:
+            raise ValueError("growth step must be positive")
+        self._step = step
+
+    def __call__(self, capacity, needed):
+        """
+        Return new capacity of at least needed elements.
+        """
+        return max(needed, capacity + self._step)
+
+def cpython_growth(capacity, needed):
+    """
+    Growth policy mimicking CPython's list over-allocation
+    (needed + needed/8 + 6, rounded down to a multiple of 4).
+    """
+    return max(needed, (needed + (needed >> 3) + 6) & ~3)
+
 class DynamicArray:
     """
     A dynamic array class akin to a simplified Python list.
+
+    With typecode=None (the default) elements are arbitrary Python objects
+    held in a ctypes.py_object array. Given one of the array module's
+    typecodes (e.g. "q" or "d") elements are instead packed into a
+    contiguous array.array buffer, which view() exposes without copying.
+
+    growth is a callable (capacity, needed) -> new capacity, such as
+    GeometricGrowth, AdditiveGrowth or cpython_growth; the default doubles.
+    Removals halve the capacity once the array drops below a quarter full,
+    but never below a capacity set aside by reserve().
     """
 
-    def __init__(self):
+    def __init__(self, typecode=None, growth=None):
+        if typecode is not None and typecode not in array.typecodes:
+            raise ValueError("invalid typecode")
+        self._typecode = typecode
+        self._growth = growth if growth is not None else GeometricGrowth(2)
+        self._resizes = 0
         self._n = 0
         self._capacity = 1
+        self._reserved = 1          # capacity floor kept by _shrink
         self._A = self._make_array(self._capacity)
 
     def __len__(self):
@@ -15,74 +97,467 @@ class DynamicArray:
         """
         return self._n
 
-    def __getitem__(self, k):
+    def _index(self, k):
         """
-        Return element at index k.
+        Return nonnegative position for index k, raising IndexError if invalid.
         """
-        if not k < self._n:
+        if k < 0:
+            k += self._n
+        if not 0 <= k < self._n:
             raise IndexError("invalid index")
-        return self._A[k % self._n]
-    
+        return k
+
+    def __getitem__(self, k):
+        """
+        Return element at index k, or a new DynamicArray for a slice.
+        """
+        if isinstance(k, slice):
+            result = DynamicArray(self._typecode)
+            start, stop, step = k.indices(self._n)
+            if len(range(start, stop, step)) > 0:
+                # a negative stop would wrap around the underlying capacity
+                result.extend(self._A[start:stop if stop >= 0 else None:step])
+            return result
+        return self._A[self._index(k)]
+
+    def __setitem__(self, k, value):
+        """
+        Replace element at index k, or the elements of a slice.
+
+        A step-1 slice may be replaced by a sequence of different length
+        (O(n) worst case, one tail shift); an extended slice requires a
+        sequence of exactly the same length.
+        """
+        if not isinstance(k, slice):
+            j = self._index(k)
+            if value is None:
+                self._vacate(j, j + 1)
+            self._A[j] = value
+            return
+        # convert first, so a rejected value leaves the array untouched
+        values = self._block(list(value))
+        start, stop, step = k.indices(self._n)
+        if step == 1:
+            stop = max(start, stop)
+            del self[start:stop]
+            self.insert_many(start, values)
+            return
+        positions = range(start, stop, step)
+        if len(values) != len(positions):
+            raise ValueError("attempt to assign sequence of size {0} "
+                             "to extended slice of size {1}"
+                             .format(len(values), len(positions)))
+        if positions:
+            stop = stop if stop >= 0 else None
+            if self._typecode is None and None in values:
+                self._A[start:stop:step] = [0] * len(positions)
+            self._A[start:stop:step] = values
+
+    def __delitem__(self, k):
+        """
+        Remove element at index k, or all elements of a slice.
+
+        Surviving elements are compacted leftward in a single pass (one
+        block move for contiguous ranges), so deleting a range costs
+        O(n - start) regardless of its length.
+        """
+        if isinstance(k, slice):
+            positions = range(*k.indices(self._n))
+            if positions.step < 0:
+                positions = positions[::-1]
+        else:
+            j = self._index(k)
+            positions = range(j, j + 1)
+        if len(positions) == 0:
+            return
+        if positions.step == 1:
+            start, stop = positions.start, positions.stop
+            write = self._n - (stop - start)
+            self._A[start:write] = self._A[stop:self._n]
+            self._vacate(write, self._n)
+            self._n = write
+            self._shrink()
+            return
+        write = positions.start
+        for read in range(positions.start, self._n):
+            if read in positions:
+                continue
+            self._A[write] = self._A[read]
+            write += 1
+        self._vacate(write, self._n)
+        self._n = write
+        self._shrink()
+
     def append(self, obj):
         """
         Add object to end of the array.
         """
         if self._n == self._capacity:
-            self._resize(2 * self._capacity, self._n)
+            self._resize(self._grow(self._n + 1), self._n)
         self._A[self._n] = obj
         self._n += 1
 
+    def extend(self, iterable):
+        """
+        Add every element of iterable to end of the array.
+
+        Sized inputs are copied as one block after at most one resize;
+        other iterables reserve capacity from __length_hint__ first.
+        Amortized O(1) per element.
+        """
+        if hasattr(iterable, "__len__"):
+            self.insert_many(self._n, iterable)
+            return
+        needed = self._n + operator.length_hint(iterable)
+        if needed > self._capacity:
+            self._resize(self._grow(needed), self._n)
+        for obj in iterable:
+            if self._n == self._capacity:
+                self._resize(self._grow(self._n + 1), self._n)
+            self._A[self._n] = obj
+            self._n += 1
+
     def insert(self, k, value):
         """
         Insert value at index k, shifting subsequen values rightward.
+
+        As with list.insert, k is clamped to the valid range.
         """
+        if self._typecode is not None:
+            # convert first, so a rejected value leaves the array untouched
+            value = array.array(self._typecode, [value])[0]
+        if k < 0:
+            k = max(0, k + self._n)
+        k = min(k, self._n)
         if self._n == self._capacity:
-            self._resize(2 * self._capacity, k)
+            self._resize(self._grow(self._n + 1), k)
         else:
-            for j in range(self._n, k, -1):
-                self._A[j] = self._A[j-1]
+            self._A[k+1:self._n+1] = self._A[k:self._n]
         self._A[k] = value
         self._n += 1
 
-    def _resize(self, c, j):
+    def insert_many(self, k, seq):
+        """
+        Insert all values of seq starting at index k.
+
+        The tail is shifted rightward exactly once, so inserting m values
+        costs O(n - k + m) rather than the O(m(n - k)) of repeated insert.
+        As with list.insert, k is clamped to the valid range.
+        """
+        # convert first, so a rejected value leaves the array untouched
+        values = self._block(list(seq))
+        m = len(values)
+        if k < 0:
+            k = max(0, k + self._n)
+        k = min(k, self._n)
+        if self._n + m > self._capacity:
+            self._resize(self._grow(self._n + m), k, m)
+        else:
+            self._A[k+m:self._n+m] = self._A[k:self._n]
+        self._A[k:k+m] = values
+        self._n += m
+
+    def pop(self, k=-1):
+        """
+        Remove and return element at index k (default last).
+
+        O(1) at the end, O(n - k) in general.
+        """
+        if self._n == 0:
+            raise IndexError("pop from empty array")
+        k = self._index(k)
+        answer = self._A[k]
+        del self[k]
+        return answer
+
+    def remove(self, value):
+        """
+        Remove first occurrence of value, raising ValueError if absent.
+        """
+        for k in range(self._n):
+            if self._A[k] == value:
+                del self[k]
+                return
+        raise ValueError("value not found")
+
+    def capacity(self):
+        """
+        Return number of elements the array can hold without resizing.
+        """
+        return self._capacity
+
+    def reserve(self, c):
+        """
+        Ensure capacity for at least c elements.
+
+        The reservation is kept through later removals until
+        shrink_to_fit() is called.
+        """
+        self._reserved = max(self._reserved, c)
+        if c > self._capacity:
+            self._resize(c, self._n)
+
+    def shrink_to_fit(self):
+        """
+        Release unused capacity so that it equals len(self) (minimum 1),
+        dropping any reservation.
+        """
+        self._reserved = 1
+        c = max(self._n, 1)
+        if c < self._capacity:
+            self._resize(c, self._n)
+
+    def _grow(self, needed):
+        """
+        Return capacity chosen by the growth policy for needed elements.
+        """
+        return max(needed, self._growth(self._capacity, needed))
+
+    def _shrink(self):
+        """
+        Halve capacity while the array is less than a quarter full.
+
+        Shrinking to half (not to fit) leaves slack on both sides, so
+        alternating appends and removals cannot trigger repeated resizes.
+        """
+        c = self._capacity
+        while c // 2 >= self._reserved and self._n < c // 4:
+            c //= 2
+        if c < self._capacity:
+            self._resize(c, self._n)
+
+    def _vacate(self, lo, hi):
+        """
+        Clear slots lo..hi-1 so that object mode drops its references.
+        """
+        # ctypes keeps the previous reference when None is stored in a
+        # py_object slot (even by slice assignment), so overwrite with a
+        # cached int instead
+        if self._typecode is None:
+            self._A[lo:hi] = [0] * (hi - lo)
+
+    def _block(self, values):
+        """
+        Return list of values in a form accepted by slice assignment to _A.
+        """
+        if self._typecode is None:
+            return values
+        return array.array(self._typecode, values)
+
+    def _resize(self, c, j, m=1):
         """
         Resize internal array to capacity c.
-        Item to be inserted at position j. Shift relevant values rightward if required.
+        Item(s) to be inserted at position j. Shift relevant values rightward by m if required.
         """
         """
         self._n = 7, j = 5
         B[0] = A[0], B[1] = A[1], ... , B[4] = A[4]
-        B[6] = A[5], B[7] = A[6], B[8] = A[7]
+        B[6] = A[5], B[7] = A[6]
 
         self._n = 3, j = 3
         B[0] = A[0], B[1] = A[1], ..., B[3] = A[3]
         """
+        # slice assignment copies each block in C; for py_object arrays
+        # ctypes keeps its own references, so refcounts stay correct
         B = self._make_array(c)
-        for k in range(j):
-            B[k] = self._A[k]
-        
+        B[0:j] = self._A[0:j]
         if j < self._n:
-            for k in range(j, self._n+1):
-                B[k+1] = self._A[k]
+            B[j+m:self._n+m] = self._A[j:self._n]
         self._A = B
         self._capacity = c
+        self._resizes += 1
 
     def _make_array(self, c):
         """
         Return new array with capacity c.
         """
+        if self._typecode is not None:
+            itemsize = array.array(self._typecode).itemsize
+            return array.array(self._typecode, bytes(c * itemsize))
         return (c * ctypes.py_object)()
 
+    def typecode(self):
+        """
+        Return the typecode of the packed storage, or None in object mode.
+        """
+        return self._typecode
+
+    def view(self):
+        """
+        Return a zero-copy memoryview over the stored elements.
+
+        Only available in typed mode; the view can be handed to
+        numpy.asarray without copying. Views taken before a resize keep
+        referring to the old buffer.
+        """
+        if self._typecode is None:
+            raise TypeError("view requires a typed DynamicArray")
+        return memoryview(self._A)[:self._n]
+
+    def __buffer__(self, flags):
+        """
+        Support memoryview(a) directly on Python 3.12+.
+        """
+        return self.view()
+
     def __str__(self):
         """
         Return a string representation of the Dynamic Array
         """
         return str(self._A)
 
+def benchmark_dynamic_array_memory(n=10**6):
+    """
+    Report bytes allocated to store n distinct ints in a list, an
+    object-mode DynamicArray and typed DynamicArrays.
+    """
+    def build_list():
+        data = []
+        for k in range(n):
+            data.append(k + 1000)
+        return data
+
+    def build_dynamic(typecode):
+        def build():
+            data = DynamicArray(typecode)
+            for k in range(n):
+                data.append(k + 1000)
+            return data
+        return build
+
+    cases = [("list", build_list),
+             ("DynamicArray()", build_dynamic(None)),
+             ("DynamicArray('q')", build_dynamic("q")),
+             ("DynamicArray('d')", build_dynamic("d"))]
+    for label, build in cases:
+        tracemalloc.start()
+        data = build()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print("{0:20s} n={1}; bytes: {2:12d}; peak: {3:12d}; per item: {4:6.2f}"
+              .format(label, n, current, peak, current / n))
+        del data
+
+def _time(fn, repeat=3):
+    """
+    Return best wall-clock time in seconds of calling fn() repeat times.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def benchmark_dynamic_array_bulk(n=10**5):
+    """
+    Compare bulk DynamicArray operations against the equivalent list calls.
+    """
+    values = list(range(n))
+    chunk = list(range(n // 10))
+
+    def filled(kind):
+        if kind is list:
+            return list(values)
+        data = DynamicArray()
+        data.extend(values)
+        return data
+
+    def append_loop(kind):
+        data = kind()
+        for v in values:
+            data.append(v)
+
+    def extend(kind):
+        data = kind()
+        data.extend(values)
+
+    def insert_many(kind):
+        data = filled(kind)
+        if kind is list:
+            data[n // 2:n // 2] = chunk
+        else:
+            data.insert_many(n // 2, chunk)
+
+    def slice_get(kind):
+        data = filled(kind)
+        data[n // 4:3 * n // 4]
+
+    def delete_range(kind):
+        data = filled(kind)
+        del data[n // 4:n // 2]
+
+    def pop_all(kind):
+        data = filled(kind)
+        for _ in range(n):
+            data.pop()
+
+    print("{0:22s} {1:>12s} {2:>16s}".format("n={0}".format(n), "list (s)", "DynamicArray (s)"))
+    for op in (append_loop, extend, insert_many, slice_get, delete_range, pop_all):
+        print("{0:22s} {1:12.4f} {2:16.4f}".format(
+            op.__name__, _time(lambda: op(list)), _time(lambda: op(DynamicArray))))
+
+def benchmark_growth_policies(n=10**5):
+    """
+    Report reallocations and peak bytes per growth policy for a workload
+    that appends n integers, then pops them all.
+    """
+    policies = [("double", GeometricGrowth(2)),
+                ("x1.5", GeometricGrowth(1.5)),
+                ("+1024", AdditiveGrowth(1024)),
+                ("cpython", cpython_growth)]
+    print("{0:10s} {1:>8s} {2:>14s} {3:>14s} {4:>10s}".format(
+        "policy", "resizes", "peak capacity", "peak bytes", "time (s)"))
+    for label, policy in policies:
+        data = DynamicArray("q", growth=policy)
+        peak_capacity = 0
+        tracemalloc.start()
+        start = time.perf_counter()
+        for k in range(n):
+            data.append(k)
+            peak_capacity = max(peak_capacity, data.capacity())
+        for k in range(n):
+            data.pop()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("{0:10s} {1:8d} {2:14d} {3:14d} {4:10.4f}".format(
+            label, data._resizes, peak_capacity, peak, elapsed))
+
+def benchmark_dynamic_array_moves(sizes=(10**3, 10**4, 10**5, 10**6, 10**7),
+                                  inserts=100):
+    """
+    Report append and middle-insert throughput (operations per second)
+    for DynamicArray in object and typed mode and for list.
+    """
+    kinds = [("list", list),
+             ("DynamicArray()", DynamicArray),
+             ("DynamicArray('q')", lambda: DynamicArray("q"))]
+    print("{0:20s} {1:>10s} {2:>14s} {3:>14s}".format(
+        "kind", "n", "appends/s", "inserts/s"))
+    for n in sizes:
+        for label, kind in kinds:
+            data = kind()
+            start = time.perf_counter()
+            for k in range(n):
+                data.append(k)
+            appends = n / (time.perf_counter() - start)
+            start = time.perf_counter()
+            for k in range(inserts):
+                data.insert(n // 2, k)
+            middle = inserts / (time.perf_counter() - start)
+            print("{0:20s} {1:10d} {2:14.0f} {3:14.0f}".format(
+                label, n, appends, middle))
+            del data
+
 class GameEntry:
     """
     Represents one entry of a list of high scores.
+
+    Entries order by score, so they can be sorted or pushed onto a heap
+    directly; equality is still identity.
     """
+    __slots__ = "_name", "_score"
 
     def __init__(self, name, score):
         self._name = name
@@ -97,6 +572,43 @@ class GameEntry:
     def __str__(self):
         return '({0}, {1})'.format(self._name, self._score)
 
+    def __lt__(self, other):
+        if not isinstance(other, GameEntry):
+            return NotImplemented
+        return self._score < other._score
+
+    def __le__(self, other):
+        if not isinstance(other, GameEntry):
+            return NotImplemented
+        return self._score <= other._score
+
+    def __gt__(self, other):
+        if not isinstance(other, GameEntry):
+            return NotImplemented
+        return self._score > other._score
+
+    def __ge__(self, other):
+        if not isinstance(other, GameEntry):
+            return NotImplemented
+        return self._score >= other._score
+
+def benchmark_game_entry_memory(n=10**6):
+    """
+    Report bytes per GameEntry with __slots__ against the former
+    __dict__-backed layout (emulated by a subclass without __slots__).
+    """
+    class DictGameEntry(GameEntry):
+        pass
+
+    for label, cls in (("__dict__", DictGameEntry), ("__slots__", GameEntry)):
+        tracemalloc.start()
+        entries = [cls("player", k) for k in range(n)]
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print("{0:10s} n={1}: {2:8.1f} bytes per entry (getsizeof {3})".format(
+            label, n, current / n, sys.getsizeof(entries[0])))
+        del entries
+
 class Scoreboard:
     """
     Fixed-length sequence of high scores in nondecreasing order.
@@ -145,6 +657,253 @@ class Scoreboard:
                 j -= 1
             self._board[j] = entry
 
+    def ingest(self, names, scores):
+        """
+        Consider adding one entry per (names[i], scores[i]) pair.
+
+        Columns may be lists, array.array or NumPy arrays. Scores are
+        filtered against the current last entry and the best len(self._board)
+        survivors are selected on the columns directly (by partition when
+        NumPy is available); GameEntry objects are only built for them.
+        The result is the same as calling add for each pair in order.
+        """
+        if len(names) != len(scores):
+            raise ValueError("names and scores must have equal length")
+        capacity = len(self._board)
+        threshold = None
+        if self._n == capacity:
+            threshold = self._board[-1].get_score()
+        if np is not None and not isinstance(scores, (list, tuple)):
+            chosen, chosen_scores = _top_k_numpy(np.asarray(scores), capacity, threshold)
+        else:
+            chosen, chosen_scores = _top_k_python(scores, capacity, threshold)
+        if not chosen:
+            return
+        self._merge_sorted([GameEntry(names[i], score)
+                            for i, score in zip(chosen, chosen_scores)])
+
+    def merge(self, other):
+        """
+        Fold the entries of another Scoreboard into this one in O(k).
+
+        Among equal scores, entries already on this board stay ahead.
+        """
+        self._merge_sorted(other._board[:other._n])
+
+    def _merge_sorted(self, entries):
+        """
+        Merge a list of entries in nonincreasing score order into the board.
+        """
+        # merge is stable, so existing entries precede new ones with equal score
+        current = self._board[:self._n]
+        merged = heapq.merge(current, entries, key=GameEntry.get_score, reverse=True)
+        self._n = 0
+        for entry in itertools.islice(merged, len(self._board)):
+            self._board[self._n] = entry
+            self._n += 1
+
+def merge_scoreboards(boards, capacity=10):
+    """
+    Return new Scoreboard holding the best entries of all given boards.
+
+    Performs one k-way merge; among equal scores, entries of earlier
+    boards rank first.
+    """
+    result = Scoreboard(capacity)
+    result._merge_sorted(heapq.merge(*(board._board[:board._n] for board in boards),
+                                     key=GameEntry.get_score, reverse=True))
+    return result
+
+def _ingest_shard(names, scores, capacity):
+    """
+    Return Scoreboard of one shard's columns (process pool worker).
+    """
+    board = Scoreboard(capacity)
+    board.ingest(names, scores)
+    return board
+
+def parallel_scoreboard(names, scores, capacity=10, workers=None):
+    """
+    Return Scoreboard of the given columns, ingesting contiguous shards in
+    a process pool and reducing the local boards with merge_scoreboards.
+
+    The result is the same as a single board ingesting every pair in order.
+    """
+    if len(names) != len(scores):
+        raise ValueError("names and scores must have equal length")
+    workers = workers or os.cpu_count() or 1
+    step = -(-len(names) // workers) or 1
+    bounds = range(0, len(names), step)
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        boards = pool.map(_ingest_shard,
+                          [names[j:j + step] for j in bounds],
+                          [scores[j:j + step] for j in bounds],
+                          itertools.repeat(capacity))
+        return merge_scoreboards(boards, capacity)
+
+def _top_k_python(scores, k, threshold):
+    """
+    Return (indices, scores) of the k best scores above threshold (None for
+    no threshold), highest first and earlier index first among ties.
+    """
+    if threshold is None:
+        candidates = range(len(scores))
+    else:
+        candidates = [i for i, score in enumerate(scores) if score > threshold]
+    chosen = heapq.nlargest(k, candidates, key=scores.__getitem__)
+    return chosen, [scores[i] for i in chosen]
+
+def _top_k_numpy(scores, k, threshold):
+    """
+    NumPy counterpart of _top_k_python using partition-based selection.
+    """
+    candidates = np.arange(len(scores))
+    if threshold is not None:
+        candidates = np.flatnonzero(scores > threshold)
+    values = scores[candidates]
+    if len(values) > k:
+        kth = np.partition(values, len(values) - k)[len(values) - k]
+        above = np.flatnonzero(values > kth)
+        ties = np.flatnonzero(values == kth)[:k - len(above)]
+        keep = np.sort(np.concatenate((above, ties)))
+        candidates, values = candidates[keep], values[keep]
+    # stable descending order: sort the reversed array ascending, then undo
+    order = len(values) - 1 - np.argsort(values[::-1], kind="stable")[::-1]
+    return candidates[order].tolist(), values[order].tolist()
+
+class HeapScoreboard:
+    """
+    Top-k high scores kept in a bounded min-heap.
+
+    Admission costs O(log k) and a score that cannot qualify is rejected
+    in O(1) against the current minimum. Ranking matches Scoreboard:
+    higher scores first, and among equal scores earlier entries first.
+    """
+
+    def __init__(self, capacity=10):
+        """
+        Initialize empty scoreboard with given maximum capacity.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self._capacity = capacity
+        self._heap = []     # (score, -arrival, entry); root is the weakest
+        self._arrivals = 0
+        self._ranked = None # sorted snapshot for __getitem__, reset on change
+
+    def __len__(self):
+        """
+        Return number of entries currently on the board.
+        """
+        return len(self._heap)
+
+    def __iter__(self):
+        """
+        Generate entries from highest to lowest score (O(k log k) snapshot).
+        """
+        for item in sorted(self._heap, reverse=True):
+            yield item[2]
+
+    def __getitem__(self, k):
+        """
+        Return entry at rank k (0 is the highest score).
+
+        The ranking is sorted once and reused until the board changes.
+        """
+        if self._ranked is None:
+            self._ranked = list(self)
+        return self._ranked[k]
+
+    def __str__(self):
+        """
+        Return string representation of the high score list.
+        """
+        return "\n".join(str(entry) for entry in self)
+
+    def threshold(self):
+        """
+        Return score a new entry must beat, or None while the board is not full.
+        """
+        if len(self._heap) < self._capacity:
+            return None
+        return self._heap[0][0]
+
+    def add(self, entry):
+        """
+        Consider adding entry to high scores.
+        """
+        score = entry.get_score()
+        heap = self._heap
+        if len(heap) == self._capacity and not score > heap[0][0]:
+            return
+        self._arrivals += 1
+        self._ranked = None
+        item = (score, -self._arrivals, entry)
+        if len(heap) < self._capacity:
+            heapq.heappush(heap, item)
+        else:
+            heapq.heapreplace(heap, item)
+
+    def add_many(self, entries):
+        """
+        Consider adding every entry of an iterable to the high scores.
+
+        Once the board is full, entries not beating the current minimum
+        are discarded before any heap operation.
+        """
+        heap = self._heap
+        capacity = self._capacity
+        self._ranked = None
+        for entry in entries:
+            score = entry.get_score()
+            if len(heap) < capacity:
+                self._arrivals += 1
+                heapq.heappush(heap, (score, -self._arrivals, entry))
+            elif score > heap[0][0]:
+                self._arrivals += 1
+                heapq.heapreplace(heap, (score, -self._arrivals, entry))
+
+def benchmark_scoreboard_ingest(n=10**6, k=1000):
+    """
+    Report events per second for Scoreboard.add (one GameEntry per event)
+    against Scoreboard.ingest on list and, if installed, NumPy columns.
+    """
+    rng = random.Random(5)
+    names = ["player{0}".format(j) for j in range(n)]
+    scores = array.array("q", (rng.randrange(10**9) for _ in range(n)))
+
+    def per_entry():
+        board = Scoreboard(k)
+        for name, score in zip(names, scores):
+            board.add(GameEntry(name, score))
+
+    def columns(score_column):
+        def run():
+            Scoreboard(k).ingest(names, score_column)
+        return run
+
+    cases = [("add", per_entry), ("ingest(list)", columns(scores.tolist()))]
+    if np is not None:
+        cases.append(("ingest(numpy)", columns(np.asarray(scores))))
+    for label, fn in cases:
+        print("{0:15s} n={1} k={2}: {3:14.0f} events/s".format(
+            label, n, k, n / _time(fn, repeat=1)))
+
+def benchmark_parallel_scoreboard(n=4 * 10**6, k=1000, max_workers=None):
+    """
+    Report ingestion time of parallel_scoreboard for 1..max_workers processes.
+    """
+    rng = random.Random(8)
+    names = ["player{0}".format(j) for j in range(n)]
+    scores = array.array("q", (rng.randrange(10**9) for _ in range(n)))
+    max_workers = max_workers or os.cpu_count() or 1
+    base = None
+    for workers in range(1, max_workers + 1):
+        elapsed = _time(lambda: parallel_scoreboard(names, scores, k, workers), repeat=1)
+        base = base or elapsed
+        print("workers={0:3d}: {1:8.3f} s; {2:12.0f} events/s; speedup {3:5.2f}".format(
+            workers, elapsed, n / elapsed, base / elapsed))
+
 def insertion_sort(A):
     """
     Sort list of comparable elements into nondecreasing order.
@@ -157,61 +916,586 @@ def insertion_sort(A):
             j -= 1
         A[j] = cur
 
+MIN_MERGE = 64
+MIN_GALLOP = 7
+
+def adaptive_sort(A, key=None, reverse=False):
+    """
+    Sort list A in place, stably, into nondecreasing order of key(e)
+    (nonincreasing if reverse is True), comparing only with <.
+
+    A Timsort-style engine: natural runs are detected (strictly descending
+    runs are reversed in place), short runs are extended with binary
+    insertion sort, and runs are merged with galloping. O(n) on presorted
+    or reversed input and O(n log n) in the worst case.
+    """
+    if key is None:
+        K, V = A, None
+    else:
+        K, V = [key(e) for e in A], A
+    # reversing before and after a stable ascending sort keeps equal
+    # elements in their original order
+    if reverse:
+        _reverse_run(K, V, 0, len(K))
+    _timsort(K, V)
+    if reverse:
+        _reverse_run(K, V, 0, len(K))
+
+def _timsort(K, V):
+    """
+    Sort key list K, applying every move to value list V (unless None).
+    """
+    n = len(K)
+    if n < 2:
+        return
+    minrun = _min_run_length(n)
+    runs = []   # stack of [base, length]
+    lo = 0
+    while lo < n:
+        run = _count_run(K, V, lo, n)
+        if run < minrun:
+            forced = min(minrun, n - lo)
+            _binary_insertion_sort(K, V, lo, lo + forced, lo + run)
+            run = forced
+        runs.append([lo, run])
+        _merge_collapse(K, V, runs)
+        lo += run
+    while len(runs) > 1:
+        _merge_at(K, V, runs, len(runs) - 2)
+
+def _min_run_length(n):
+    """
+    Return run length in [MIN_MERGE/2, MIN_MERGE] such that n / minrun
+    is, or is just below, a power of two.
+    """
+    r = 0
+    while n >= MIN_MERGE:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+def _reverse_run(K, V, lo, hi):
+    """
+    Reverse K[lo:hi] (and V[lo:hi]) in place.
+    """
+    K[lo:hi] = K[lo:hi][::-1]
+    if V is not None:
+        V[lo:hi] = V[lo:hi][::-1]
+
+def _count_run(K, V, lo, n):
+    """
+    Return length of the natural run starting at lo, reversing it first
+    if it is strictly descending.
+    """
+    hi = lo + 1
+    if hi == n:
+        return 1
+    if K[hi] < K[lo]:
+        while hi + 1 < n and K[hi + 1] < K[hi]:
+            hi += 1
+        _reverse_run(K, V, lo, hi + 1)
+    else:
+        while hi + 1 < n and not K[hi + 1] < K[hi]:
+            hi += 1
+    return hi + 1 - lo
+
+def _binary_insertion_sort(K, V, lo, hi, start):
+    """
+    Sort K[lo:hi], given that K[lo:start] is already sorted.
+
+    Insertion sort as in insertion_sort, but the position of each new
+    element is found by binary search and the shift is one slice move.
+    """
+    for k in range(start, hi):
+        cur = K[k]
+        j = bisect.bisect_right(K, cur, lo, k)
+        if j < k:
+            K[j+1:k+1] = K[j:k]
+            K[j] = cur
+            if V is not None:
+                value = V[k]
+                V[j+1:k+1] = V[j:k]
+                V[j] = value
+
+def _merge_collapse(K, V, runs):
+    """
+    Merge runs on the stack until their lengths satisfy the Timsort
+    invariants, which keeps merges balanced and the stack O(log n).
+    """
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if ((n > 0 and runs[n-1][1] <= runs[n][1] + runs[n+1][1]) or
+                (n > 1 and runs[n-2][1] <= runs[n-1][1] + runs[n][1])):
+            if runs[n-1][1] < runs[n+1][1]:
+                n -= 1
+        elif runs[n][1] > runs[n+1][1]:
+            break
+        _merge_at(K, V, runs, n)
+
+def _merge_at(K, V, runs, i):
+    """
+    Merge stack runs i and i+1.
+    """
+    base, length = runs[i]
+    length2 = runs[i+1][1]
+    runs[i] = [base, length + length2]
+    del runs[i+1]
+    _merge(K, V, base, base + length, base + length + length2)
+
+def _gallop_right(x, a, start):
+    """
+    Return bisect_right(a, x, start), probing start+1, +2, +4, ... first.
+    """
+    lo, hi, step = start, start, 1
+    while hi < len(a) and not x < a[hi]:
+        lo = hi + 1
+        hi = start + step
+        step *= 2
+    return bisect.bisect_right(a, x, lo, min(hi, len(a)))
+
+def _gallop_left(x, a, start):
+    """
+    Return bisect_left(a, x, start), probing start+1, +2, +4, ... first.
+    """
+    lo, hi, step = start, start, 1
+    while hi < len(a) and a[hi] < x:
+        lo = hi + 1
+        hi = start + step
+        step *= 2
+    return bisect.bisect_left(a, x, lo, min(hi, len(a)))
+
+def _merge(K, V, lo, mid, hi):
+    """
+    Stably merge sorted runs K[lo:mid] and K[mid:hi].
+    """
+    # left elements not above K[mid], and right elements not below
+    # K[mid-1], are already in their final place
+    lo = bisect.bisect_right(K, K[mid], lo, mid)
+    if lo == mid:
+        return
+    hi = bisect.bisect_left(K, K[mid-1], mid, hi)
+    left, right = K[lo:mid], K[mid:hi]
+    if V is not None:
+        lv, rv = V[lo:mid], V[mid:hi]
+    nl, nr = len(left), len(right)
+    i = j = 0
+    d = lo
+    while i < nl and j < nr:
+        # one element at a time until one side wins MIN_GALLOP times in a row
+        wins_left = wins_right = 0
+        while i < nl and j < nr and max(wins_left, wins_right) < MIN_GALLOP:
+            if right[j] < left[i]:
+                K[d] = right[j]
+                if V is not None:
+                    V[d] = rv[j]
+                j += 1
+                wins_right += 1
+                wins_left = 0
+            else:
+                K[d] = left[i]
+                if V is not None:
+                    V[d] = lv[i]
+                i += 1
+                wins_left += 1
+                wins_right = 0
+            d += 1
+        # galloping: copy whole blocks while they stay long
+        while i < nl and j < nr:
+            p = _gallop_right(right[j], left, i)
+            K[d:d + p - i] = left[i:p]
+            if V is not None:
+                V[d:d + p - i] = lv[i:p]
+            d += p - i
+            taken, i = p - i, p
+            if i == nl:
+                break
+            p = _gallop_left(left[i], right, j)
+            K[d:d + p - j] = right[j:p]
+            if V is not None:
+                V[d:d + p - j] = rv[j:p]
+            d += p - j
+            taken, j = max(taken, p - j), p
+            if taken < MIN_GALLOP:
+                break
+    K[d:d + nl - i] = left[i:]
+    if V is not None:
+        V[d:d + nl - i] = lv[i:]
+    d += nl - i
+    K[d:d + nr - j] = right[j:]
+    if V is not None:
+        V[d:d + nr - j] = rv[j:]
+
+def benchmark_sorts(sizes=(10, 100, 10**3, 10**4, 10**5, 10**6), insertion_limit=10**4):
+    """
+    Report seconds taken by insertion_sort, adaptive_sort and list.sort on
+    random, sorted, reversed and few-unique inputs of each size.
+    """
+    rng = random.Random(9)
+    sorts = [("insertion_sort", insertion_sort),
+             ("adaptive_sort", adaptive_sort),
+             ("list.sort", list.sort)]
+    print("{0:12s} {1:>8s} {2:>15s} {3:>15s} {4:>15s}".format(
+        "input", "n", *(label for label, _ in sorts)))
+    for n in sizes:
+        inputs = [("random", [rng.random() for _ in range(n)]),
+                  ("sorted", list(range(n))),
+                  ("reversed", list(range(n, 0, -1))),
+                  ("few-unique", [rng.randrange(4) for _ in range(n)])]
+        for label, data in inputs:
+            times = []
+            for name, fn in sorts:
+                if fn is insertion_sort and n > insertion_limit:
+                    times.append("-")
+                else:
+                    times.append("{0:.5f}".format(_time(lambda: fn(list(data)), repeat=1)))
+            print("{0:12s} {1:8d} {2:>15s} {3:>15s} {4:>15s}".format(label, n, *times))
+
 class CaesarCipher:
     """
     Class for doing encryption and decruption using a Caesar cipher.
     """
 
-    def __init__(self, shift):
+    def __init__(self, shift, alphabets=(string.ascii_uppercase, string.ascii_lowercase)):
         """
         Construct Caesar cipher using given integer shift for rotation.
 
-        To allow for other alphabet-based languages:
-         - include language parameter (ie. def __init__(self, shift, language)
-         - have if statement to define modulo and starting unicode position based on language
+        Each string in alphabets is rotated independently and all other
+        characters pass through unchanged, so other alphabet-based
+        languages only need their own alphabet strings. Translation tables
+        are built once here and applied in a single C-level pass.
         """
-        encoder = [None] * 26
-        decoder = [None] * 26
-        for k in range(26):
-            encoder[k] = chr((k + shift) % 26 + ord('A'))
-            decoder[k] = chr((k - shift) % 26 + ord('A'))
-        self._forward = "".join(encoder)
-        self._backward = "".join(decoder)
+        encoder = {}
+        decoder = {}
+        for alphabet in alphabets:
+            m = len(alphabet)
+            for k, c in enumerate(alphabet):
+                encoder[c] = alphabet[(k + shift) % m]
+                decoder[c] = alphabet[(k - shift) % m]
+        self._shift = shift
+        self._alphabets = tuple(alphabets)
+        self._forward = str.maketrans(encoder)
+        self._backward = str.maketrans(decoder)
+        self._forward_bytes = _byte_table(encoder)
+        self._backward_bytes = _byte_table(decoder)
 
     def encrypt(self, message):
         """
-        Return string representing encrypted message.
+        Return encrypted message (str, bytes or bytearray, as given).
         """
-        return self._transform(message, self._forward)
+        return self._transform(message, self._forward, self._forward_bytes)
 
     def decrypt(self, secret):
         """
-        Return decrypted message given encrypted secret.
+        Return decrypted message given encrypted secret (str, bytes or bytearray).
         """
-        return self._transform(secret, self._backward)
+        return self._transform(secret, self._backward, self._backward_bytes)
     
-    def _transform(self, original, code):
+    def _transform(self, original, table, byte_table):
         """
-        Utilisty to perform transformation based on given code string.
+        Utilisty to perform transformation based on given translation tables.
+        """
+        if isinstance(original, (bytes, bytearray)):
+            if byte_table is None:
+                raise TypeError("bytes messages require ASCII alphabets")
+            return original.translate(byte_table)
+        return original.translate(table)
+
+    def encrypt_stream(self, src, dst, chunk_size=1 << 20):
+        """
+        Encrypt everything read from src into dst, chunk_size at a time.
+
+        src is any object with read(n) (text or binary file, mmap.mmap)
+        and dst any object with write(); memory use is O(chunk_size)
+        whatever the input size. Return number of characters or bytes.
+        """
+        return self._transform_stream(src, dst, chunk_size,
+                                      self._forward, self._forward_bytes)
+
+    def decrypt_stream(self, src, dst, chunk_size=1 << 20):
+        """
+        Decrypt everything read from src into dst, chunk_size at a time.
+        """
+        return self._transform_stream(src, dst, chunk_size,
+                                      self._backward, self._backward_bytes)
+
+    def encrypt_many(self, messages, workers=None, chunk_size=10000):
         """
-        msg = list(original)
-        for k in range(len(msg)):
-            if msg[k].isupper():
-                j = ord(msg[k]) - ord('A')
-                msg[k] = code[j]
-        return "".join(msg)
+        Return list of encrypted messages, in input order.
+
+        Messages are shipped in batches of chunk_size to a pool of worker
+        processes (one per CPU by default); workers=1, or a batch that fits
+        in one chunk, runs in this process.
+        """
+        return self._transform_many(messages, workers, chunk_size, True)
+
+    def decrypt_many(self, secrets, workers=None, chunk_size=10000):
+        """
+        Return list of decrypted messages, in input order.
+        """
+        return self._transform_many(secrets, workers, chunk_size, False)
+
+    def _transform_many(self, messages, workers, chunk_size, forward):
+        """
+        Utility to transform a batch of messages across processes.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        workers = workers or os.cpu_count() or 1
+        messages = list(messages)
+        if workers == 1 or len(messages) <= chunk_size:
+            return _caesar_batch(self, messages, forward)
+        chunks = _batches(messages, chunk_size)
+        # the cipher is only a few small tables, so it is cheap to pickle
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            results = pool.map(_caesar_batch, itertools.repeat(self), chunks,
+                               itertools.repeat(forward))
+            return list(itertools.chain.from_iterable(results))
+
+    def _transform_stream(self, src, dst, chunk_size, table, byte_table):
+        """
+        Utility to transform a stream chunk by chunk.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        total = 0
+        chunk = src.read(chunk_size)
+        while chunk:
+            dst.write(self._transform(chunk, table, byte_table))
+            total += len(chunk)
+            chunk = src.read(chunk_size)
+        return total
+
+def _batches(iterable, size):
+    """
+    Generate successive lists of up to size elements from iterable.
+    """
+    walk = iter(iterable)
+    batch = list(itertools.islice(walk, size))
+    while batch:
+        yield batch
+        batch = list(itertools.islice(walk, size))
+
+def _caesar_batch(cipher, messages, forward):
+    """
+    Return list of messages encrypted (or decrypted) by cipher (pool worker).
+    """
+    if forward:
+        return [cipher.encrypt(message) for message in messages]
+    return [cipher.decrypt(message) for message in messages]
+
+def caesar_main(argv=None):
+    """
+    Command line entry point:
+    chapter-05.py {encrypt,decrypt} SHIFT [INPUT] [OUTPUT]
+
+    INPUT and OUTPUT default to standard input and output ("-"); regular
+    input files are memory-mapped. Data is processed as bytes in chunks.
+    """
+    parser = argparse.ArgumentParser(description="Caesar cipher a file.")
+    parser.add_argument("mode", choices=("encrypt", "decrypt"))
+    parser.add_argument("shift", type=int)
+    parser.add_argument("input", nargs="?", default="-")
+    parser.add_argument("output", nargs="?", default="-")
+    parser.add_argument("--chunk-size", type=int, default=1 << 20)
+    args = parser.parse_args(argv)
+
+    cipher = CaesarCipher(args.shift)
+    stream = cipher.encrypt_stream if args.mode == "encrypt" else cipher.decrypt_stream
+    with contextlib.ExitStack() as stack:
+        if args.input == "-":
+            src = sys.stdin.buffer
+        else:
+            src = stack.enter_context(open(args.input, "rb"))
+            if os.fstat(src.fileno()).st_size > 0:
+                src = stack.enter_context(
+                    mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ))
+        if args.output == "-":
+            dst = sys.stdout.buffer
+        else:
+            dst = stack.enter_context(open(args.output, "wb"))
+        stream(src, dst, args.chunk_size)
+    return 0
+
+def benchmark_caesar_stream(size_mb=64, chunk_size=1 << 20):
+    """
+    Report MB/s and peak traced memory of encrypting a size_mb file via
+    the whole-string path against encrypt_stream.
+    """
+    cipher = CaesarCipher(3)
+    line = b"THE EAGLE IS IN PLAY; meet at Joe's. 0123456789\n"
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = os.path.join(tmp, "plain.txt")
+        secret = os.path.join(tmp, "secret.txt")
+        with open(plain, "wb") as f:
+            block = line * ((1 << 20) // len(line))
+            for _ in range(size_mb):
+                f.write(block)
+        size = os.path.getsize(plain) / 2**20
+
+        def whole_string():
+            with open(plain) as f:
+                text = f.read()
+            with open(secret, "w") as f:
+                f.write(cipher.encrypt(text))
+
+        def streamed():
+            with open(plain, "rb") as f, open(secret, "wb") as g:
+                cipher.encrypt_stream(f, g, chunk_size)
+
+        for label, fn in (("string", whole_string), ("stream", streamed)):
+            tracemalloc.start()
+            elapsed = _time(fn, repeat=1)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print("{0:8s} {1:.0f} MB: {2:8.1f} MB/s; peak {3:8.1f} MB".format(
+                label, size, size / elapsed, peak / 2**20))
+
+def benchmark_caesar_many(n=10**6, max_workers=None, chunk_sizes=(1000, 10000, 100000)):
+    """
+    Report messages per second of encrypt_many for 1..max_workers
+    processes and each chunk size.
+    """
+    cipher = CaesarCipher(3)
+    rng = random.Random(12)
+    messages = ["".join(rng.choice(string.ascii_letters + " ") for _ in range(32))
+                for _ in range(1000)] * (n // 1000)
+    max_workers = max_workers or os.cpu_count() or 1
+    for workers in range(1, max_workers + 1):
+        for chunk_size in chunk_sizes:
+            elapsed = _time(lambda: cipher.encrypt_many(messages, workers, chunk_size),
+                            repeat=1)
+            print("workers={0:3d} chunk={1:7d}: {2:12.0f} messages/s".format(
+                workers, chunk_size, len(messages) / elapsed))
+
+def _byte_table(mapping):
+    """
+    Return 256-byte translation table for a char->char mapping, or None if
+    the mapping is not pure ASCII.
+
+    ASCII bytes never occur inside multi-byte UTF-8 sequences, so the
+    table is also safe to apply to UTF-8 encoded text.
+    """
+    table = bytearray(range(256))
+    for c, code in mapping.items():
+        if ord(c) > 127 or ord(code) > 127:
+            return None
+        table[ord(c)] = ord(code)
+    return bytes(table)
+
+# relative frequency (percent) of A..Z in English text
+ENGLISH_FREQUENCIES = (8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015,
+                       6.094, 6.966, 0.153, 0.772, 4.025, 2.406, 6.749,
+                       7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758,
+                       0.978, 2.360, 0.150, 1.974, 0.074)
+
+# one default cipher per shift, so cracking a message builds no tables
+_CRACK_CIPHERS = [CaesarCipher(shift) for shift in range(26)]
+
+def crack(ciphertext):
+    """
+    Return (shift, plaintext) for a ciphertext of the default CaesarCipher.
+
+    The letter histogram is computed in one pass, every shift is scored
+    by chi-squared against English by rotating that histogram, and only
+    the winning shift is used to decrypt.
+    """
+    return crack_many([ciphertext])[0]
+
+def crack_many(ciphertexts):
+    """
+    Return list of (shift, plaintext) pairs, one per ciphertext.
+
+    All histograms are scored together (as one array operation when NumPy
+    is available).
+    """
+    texts = list(ciphertexts)
+    scores = _shift_scores([_letter_histogram(text) for text in texts])
+    result = []
+    for text, row in zip(texts, scores):
+        shift = min(range(26), key=row.__getitem__)
+        result.append((shift, _CRACK_CIPHERS[shift].decrypt(text)))
+    return result
+
+def _letter_histogram(text):
+    """
+    Return list of 26 case-folded counts of A..Z in text (str or bytes).
+    """
+    counts = collections.Counter(text)
+    if isinstance(text, (bytes, bytearray)):
+        return [counts[65 + k] + counts[97 + k] for k in range(26)]
+    return [counts[chr(65 + k)] + counts[chr(97 + k)] for k in range(26)]
+
+def _shift_scores(histograms):
+    """
+    Return, per histogram, the chi-squared statistic of each of the 26
+    shifts: score[s] compares letter k of English with count[(k+s) % 26].
+    """
+    if np is not None and histograms:
+        counts = np.asarray(histograms, dtype=np.float64)
+        totals = counts.sum(axis=1)
+        totals[totals == 0] = 1
+        expected = np.outer(totals, ENGLISH_FREQUENCIES) / 100
+        rotations = (np.arange(26)[:, None] + np.arange(26)[None, :]) % 26
+        observed = counts[:, rotations]     # shape (texts, shifts, letters)
+        chi = (observed - expected[:, None, :]) ** 2 / expected[:, None, :]
+        return chi.sum(axis=2).tolist()
+    scores = []
+    for counts in histograms:
+        total = sum(counts) or 1
+        expected = [total * f / 100 for f in ENGLISH_FREQUENCIES]
+        scores.append([sum((counts[(k + s) % 26] - expected[k]) ** 2 / expected[k]
+                           for k in range(26))
+                       for s in range(26)])
+    return scores
+
+def benchmark_caesar_crack(n=1000, length=2000):
+    """
+    Report seconds to crack n ciphertexts of given length with crack_many
+    against decrypting each one with all 26 shifts and scoring the results.
+    """
+    rng = random.Random(13)
+    words = "the eagle is in play meet at joes at noon bring the documents".split()
+    texts = []
+    for _ in range(n):
+        plain = " ".join(rng.choice(words) for _ in range(length // 5))
+        texts.append(CaesarCipher(rng.randrange(26)).encrypt(plain))
+
+    def brute_force():
+        for text in texts:
+            best = None
+            for shift in range(26):
+                candidate = CaesarCipher(shift).decrypt(text)
+                score = _shift_scores([_letter_histogram(candidate)])[0][0]
+                if best is None or score < best[0]:
+                    best = (score, shift, candidate)
+
+    print("crack_many:  {0:8.4f} s".format(_time(lambda: crack_many(texts), repeat=1)))
+    print("brute force: {0:8.4f} s".format(_time(brute_force, repeat=1)))
+
+# bit 3*i + j represents cell (i, j); the eight winning lines as masks
+WIN_LINES = (0b000000111, 0b000111000, 0b111000000,     # rows
+             0b001001001, 0b010010010, 0b100100100,     # columns
+             0b100010001, 0b001010100)                  # diagonals
+
+# WINNING[b] is 1 if the 9-bit board b contains a winning line
+WINNING = bytes(any(b & line == line for line in WIN_LINES) for b in range(512))
 
 class TicTacToe:
     """
-    Management of a Tic-Tac-Toe game(does not do strategy).
+    Management of a Tic-Tac-Toe game (strategy is delegated to
+    TicTacToeSolver through best_move).
+
+    The board is two 9-bit masks, one per player: a move is a bit-or and
+    win detection a single lookup in the 512-entry WINNING table.
     """
 
     def __init__(self):
         """
         Start a new game.
         """
-        self._board = [[" "] * 3 for j in range(3)]
+        self._marks = {"X": 0, "O": 0}
         self._player = "X"
+        self._winner = None
 
     def mark(self, i, j):
         """
@@ -219,11 +1503,14 @@ class TicTacToe:
         """
         if not (0 <= i <= 2 and 0 <= j <= 2):
             raise ValueError("Invalid board position")
-        if self._board[i][j] != " ":
+        bit = 1 << (3 * i + j)
+        if (self._marks["X"] | self._marks["O"]) & bit:
             raise ValueError("Board position occupied")
-        if self.winner() is not None:
+        if self._winner is not None:
             raise ValueError("Game is already complete")
-        self._board[i][j] = self._player
+        self._marks[self._player] |= bit
+        if WINNING[self._marks[self._player]]:
+            self._winner = self._player
         if self._player == "X":
             self._player = "O"
         else:
@@ -233,36 +1520,751 @@ class TicTacToe:
         """
         Check whether the board configuration is a win for the given player.
         """
-        board = self._board
-        return (mark == board[0][0] == board[0][1] == board[0][2] or 
-                mark == board[1][0] == board[1][1] == board[1][2] or 
-                mark == board[2][0] == board[2][1] == board[2][2] or 
-                mark == board[0][0] == board[1][0] == board[2][0] or 
-                mark == board[0][1] == board[1][1] == board[2][1] or 
-                mark == board[0][2] == board[1][2] == board[2][2] or 
-                mark == board[0][0] == board[1][1] == board[2][2] or 
-                mark == board[0][2] == board[1][1] == board[2][0])
+        return WINNING[self._marks[mark]] == 1
 
     def winner(self):
         """
         Return mark of winner player, or None to indicate a tie.
         """
-        for mark in "XO":
-            if self._is_win(mark):
-                return mark
-        return None
+        return self._winner
+
+    def best_move(self):
+        """
+        Return position (i, j) of a perfect-play move for the next player,
+        or None if the game is complete.
+        """
+        x, o = self._marks["X"], self._marks["O"]
+        k = _shared_solver().best_move(x, o)
+        if k is None:
+            return None
+        return (k // 3, k % 3)
 
     def __str__(self):
         """
         Return string representation of current game board.
         """
-        rows = ["|".join(self._board[r]) for r in range(3)]
+        cells = []
+        for k in range(9):
+            if self._marks["X"] >> k & 1:
+                cells.append("X")
+            elif self._marks["O"] >> k & 1:
+                cells.append("O")
+            else:
+                cells.append(" ")
+        rows = ["|".join(cells[3*r:3*r + 3]) for r in range(3)]
         return "\n-----\n".join(rows)
 
+class MNKGame:
+    """
+    Tic-Tac-Toe generalized to an m x n board where k in a row wins.
+
+    Each mark checks only the four lines through the cell just played
+    (O(k)), an empty-cell counter gives O(1) tie detection, and undo
+    lets search code explore moves on a single board without copying.
+    """
+    DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+    def __init__(self, m=3, n=3, k=3):
+        """
+        Start a new game on an m x n board with k in a row to win.
+        """
+        if m < 1 or n < 1 or k < 1:
+            raise ValueError("Board dimensions and k must be positive")
+        self._m, self._n, self._k = m, n, k
+        self._board = [[" "] * n for j in range(m)]
+        self._player = "X"
+        self._winner = None
+        self._empty = m * n
+        self._history = []
+
+    def mark(self, i, j):
+        """
+        Put an X or O mark at position(i,j) for next player's turn.
+        """
+        if not (0 <= i < self._m and 0 <= j < self._n):
+            raise ValueError("Invalid board position")
+        if self._board[i][j] != " ":
+            raise ValueError("Board position occupied")
+        if self._winner is not None:
+            raise ValueError("Game is already complete")
+        player = self._player
+        self._board[i][j] = player
+        self._empty -= 1
+        self._history.append((i, j))
+        if self._completes_line(i, j, player):
+            self._winner = player
+        self._player = "O" if player == "X" else "X"
+
+    def undo(self):
+        """
+        Take back the most recent mark.
+
+        Raise ValueError if no marks have been made.
+        """
+        if not self._history:
+            raise ValueError("No move to undo")
+        i, j = self._history.pop()
+        self._player = self._board[i][j]
+        self._board[i][j] = " "
+        self._empty += 1
+        # only the final move of a game can have produced its winner
+        self._winner = None
+
+    def _completes_line(self, i, j, mark):
+        """
+        Return True if the mark at (i, j) lies on a run of k equal marks.
+        """
+        board, m, n, k = self._board, self._m, self._n, self._k
+        for di, dj in self.DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                r, c = i + sign * di, j + sign * dj
+                while count < k and 0 <= r < m and 0 <= c < n and board[r][c] == mark:
+                    count += 1
+                    r += sign * di
+                    c += sign * dj
+            if count >= k:
+                return True
+        return False
+
+    def winner(self):
+        """
+        Return mark of winner player, or None to indicate a tie.
+        """
+        return self._winner
+
+    def is_tie(self):
+        """
+        Return True if the board is full with no winner.
+        """
+        return self._empty == 0 and self._winner is None
+
+    def is_over(self):
+        """
+        Return True if the game has a winner or the board is full.
+        """
+        return self._winner is not None or self._empty == 0
+
+    def __str__(self):
+        """
+        Return string representation of current game board.
+        """
+        rows = ["|".join(self._board[r]) for r in range(self._m)]
+        return ("\n" + "-" * (2 * self._n - 1) + "\n").join(rows)
+
+def _symmetry_tables():
+    """
+    Return, for each of the 8 symmetries of the square, a list mapping
+    every 9-bit mask to its transformed mask.
+    """
+    def rotate(i, j):
+        return j, 2 - i
+
+    tables = []
+    for reflect in (False, True):
+        for turns in range(4):
+            target = []
+            for k in range(9):
+                i, j = divmod(k, 3)
+                if reflect:
+                    j = 2 - j
+                for _ in range(turns):
+                    i, j = rotate(i, j)
+                target.append(3 * i + j)
+            tables.append([sum(1 << target[k] for k in range(9) if b >> k & 1)
+                           for b in range(512)])
+    return tables
+
+class TicTacToeSolver:
+    """
+    Perfect-play TicTacToe solver on 9-bit masks.
+
+    Negamax with alpha-beta pruning; positions are cached in a
+    transposition table keyed on the smallest encoding among the 8
+    symmetric boards, so each equivalence class is searched once.
+    Scores are from the view of the player to move: 0 for a draw,
+    1 + (empty cells left) for a win, so quicker wins score higher.
+    """
+    EXACT, LOWER, UPPER = 0, 1, 2
+    MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)    # center, corners, edges
+    _SYMMETRIES = _symmetry_tables()
+
+    def __init__(self, use_table=True, book_plies=2):
+        """
+        Create solver; precompute best moves for all positions of up to
+        book_plies marks into the opening book.
+        """
+        self._use_table = use_table
+        self._table = {}
+        self.nodes = 0
+        self.opening_book = {}
+        self._build_book(0, 0, book_plies)
+
+    def value(self, x, o):
+        """
+        Return game-theoretic value for the player to move: 1 win, 0 draw, -1 loss.
+        """
+        me, opp = self._sides(x, o)
+        score = self._search(me, opp, -10, 10)
+        return (score > 0) - (score < 0)
+
+    def best_move(self, x, o):
+        """
+        Return cell index (3*i + j) of a best move for the player to move,
+        or None if the game is complete.
+        """
+        if (x, o) in self.opening_book:
+            return self.opening_book[(x, o)]
+        me, opp = self._sides(x, o)
+        if WINNING[me] or WINNING[opp] or me | opp == 0x1FF:
+            return None
+        best, best_score = None, -10
+        for k in self.MOVE_ORDER:
+            bit = 1 << k
+            if (me | opp) & bit:
+                continue
+            score = -self._search(opp, me | bit, -10, 10)
+            if score > best_score:
+                best, best_score = k, score
+        return best
+
+    def _sides(self, x, o):
+        """
+        Return (mover, other) masks; X moves when both have equal counts.
+        """
+        if bin(x).count("1") == bin(o).count("1"):
+            return x, o
+        return o, x
+
+    def _canonical(self, me, opp):
+        """
+        Return smallest 18-bit encoding of (me, opp) over all symmetries.
+        """
+        return min(t[me] | t[opp] << 9 for t in self._SYMMETRIES)
+
+    def _search(self, me, opp, alpha, beta):
+        """
+        Return negamax score of position where me is to move.
+        """
+        self.nodes += 1
+        occupied = me | opp
+        empty = 9 - bin(occupied).count("1")
+        if WINNING[opp]:
+            return -(1 + empty)
+        if empty == 0:
+            return 0
+        key = None
+        if self._use_table:
+            key = self._canonical(me, opp)
+            entry = self._table.get(key)
+            if entry is not None:
+                score, flag = entry
+                if flag == self.EXACT:
+                    return score
+                if flag == self.LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+        original_alpha = alpha
+        best = -10
+        for k in self.MOVE_ORDER:
+            bit = 1 << k
+            if occupied & bit:
+                continue
+            score = -self._search(opp, me | bit, -beta, -alpha)
+            if score > best:
+                best = score
+                alpha = max(alpha, score)
+                if alpha >= beta:
+                    break
+        if key is not None:
+            if best <= original_alpha:
+                flag = self.UPPER
+            elif best >= beta:
+                flag = self.LOWER
+            else:
+                flag = self.EXACT
+            self._table[key] = (best, flag)
+        return best
+
+    def _build_book(self, x, o, plies):
+        """
+        Record best moves for all positions reachable within plies moves.
+        """
+        if plies <= 0:
+            return
+        k = self.best_move(x, o)
+        if k is None:
+            return
+        self.opening_book[(x, o)] = k
+        x_to_move = bin(x).count("1") == bin(o).count("1")
+        for cell in range(9):
+            bit = 1 << cell
+            if not (x | o) & bit:
+                if x_to_move:
+                    self._build_book(x | bit, o, plies - 1)
+                else:
+                    self._build_book(x, o | bit, plies - 1)
+
+_solver = None
+
+def _shared_solver():
+    """
+    Return the process-wide TicTacToeSolver, creating it on first use.
+    """
+    global _solver
+    if _solver is None:
+        _solver = TicTacToeSolver()
+    return _solver
+
+def benchmark_tictactoe_solver():
+    """
+    Report nodes searched to solve the empty board with and without the
+    transposition table, and to then answer best_move for every reachable
+    position.
+    """
+    for use_table in (False, True):
+        solver = TicTacToeSolver(use_table, book_plies=0)
+        start = time.perf_counter()
+        value = solver.value(0, 0)
+        root_nodes = solver.nodes
+        positions = 0
+        frontier = {(0, 0)}
+        while frontier:
+            following = set()
+            for x, o in frontier:
+                k = solver.best_move(x, o)
+                if k is None:
+                    continue
+                positions += 1
+                for cell in range(9):
+                    bit = 1 << cell
+                    if not (x | o) & bit:
+                        if bin(x).count("1") == bin(o).count("1"):
+                            following.add((x | bit, o))
+                        else:
+                            following.add((x, o | bit))
+            frontier = following
+        elapsed = time.perf_counter() - start
+        print("table={0!s:5s} value={1}: {2:8d} nodes for the root, {3:9d} for "
+              "best_move on {4} positions ({5:.3f} s)".format(
+                  use_table, value, root_nodes, solver.nodes, positions, elapsed))
+
+def simulate_tictactoe(games, seed=None):
+    """
+    Play games random TicTacToe games in lock-step with NumPy.
+
+    Return (outcomes, moves): outcomes is an int8 array with 1 for an X
+    win, 2 for an O win and 0 for a tie; moves is a (games, 9) int8
+    array of cell indices (3*i + j) in play order, padded with -1.
+    """
+    if np is None:
+        raise ImportError("simulate_tictactoe requires NumPy")
+    rng = np.random.default_rng(seed)
+    winning = np.frombuffer(WINNING, dtype=np.uint8).astype(bool)
+    cells = np.arange(9, dtype=np.uint16)
+    marks = np.zeros((2, games), dtype=np.uint16)  # X and O bitboards
+    outcomes = np.zeros(games, dtype=np.int8)
+    moves = np.full((games, 9), -1, dtype=np.int8)
+    active = np.ones(games, dtype=bool)
+    for ply in range(9):
+        player = ply % 2
+        live = np.flatnonzero(active)
+        if len(live) == 0:
+            break
+        occupied = (marks[0, live] | marks[1, live])[:, None] >> cells & 1
+        # uniformly random legal move: largest random key among empty cells
+        keys = rng.random((len(live), 9))
+        keys[occupied == 1] = -1.0
+        move = keys.argmax(axis=1)
+        moves[live, ply] = move
+        marks[player, live] |= (1 << move).astype(np.uint16)
+        won = winning[marks[player, live]]
+        outcomes[live[won]] = player + 1
+        active[live[won]] = False
+    return outcomes, moves
+
+def benchmark_tictactoe_simulation(games=10**6):
+    """
+    Report games per second of simulate_tictactoe against playing one
+    TicTacToe object per game.
+    """
+    rng = random.Random(17)
+
+    def object_loop():
+        for _ in range(games // 10):
+            game = TicTacToe()
+            for k in rng.sample(range(9), 9):
+                game.mark(k // 3, k % 3)
+                if game.winner() is not None:
+                    break
+
+    elapsed = _time(object_loop, repeat=1)
+    print("TicTacToe objects:  {0:12.0f} games/s".format(games // 10 / elapsed))
+    elapsed = _time(lambda: simulate_tictactoe(games, seed=17), repeat=1)
+    print("simulate_tictactoe: {0:12.0f} games/s".format(games / elapsed))
+
+def benchmark_tictactoe(games=10**5):
+    """
+    Report moves per second of random TicTacToe self-play.
+    """
+    rng = random.Random(14)
+    orders = [rng.sample(range(9), 9) for _ in range(1000)]
+
+    def play():
+        moves = 0
+        for g in range(games):
+            game = TicTacToe()
+            for k in orders[g % len(orders)]:
+                game.mark(k // 3, k % 3)
+                moves += 1
+                if game.winner() is not None:
+                    break
+        return moves
+
+    start = time.perf_counter()
+    moves = play()
+    elapsed = time.perf_counter() - start
+    print("{0} games, {1} moves: {2:12.0f} moves/s".format(games, moves, moves / elapsed))
+
+def repeated_counts(A):
+    """
+    Return dict mapping each value occurring more than once in iterable A
+    to its number of occurrences, in order of first occurrence.
+
+    One pass with a hash table: O(n) expected time, O(distinct) memory.
+    A is not modified.
+    """
+    counts = collections.Counter(A)
+    return {value: count for value, count in counts.items() if count > 1}
+
+def iter_duplicates(iterable):
+    """
+    Generate each value of iterable as soon as it is seen for the second time.
+
+    Streaming form of repeated_counts: O(1) expected time per element,
+    O(distinct) memory, and works on unbounded iterators.
+    """
+    seen = set()
+    reported = set()
+    for value in iterable:
+        if value in seen:
+            if value not in reported:
+                reported.add(value)
+                yield value
+        else:
+            seen.add(value)
+
+def find_duplicate_floyd(A):
+    """
+    Return a repeated value of sequence A of n+1 integers drawn from 1..n.
+
+    Treats i -> A[i] as a linked list, which must contain a cycle whose
+    entry is a duplicate (Floyd's tortoise and hare): O(n) time, O(1)
+    extra memory, and A is not modified.
+    """
+    n = len(A) - 1
+    if n < 1:
+        raise ValueError("sequence must have at least two elements")
+    # the cycle argument needs every value in range, so check them all
+    if min(A) < 1 or max(A) > n:
+        raise ValueError("values must lie in 1..len(A)-1")
+    slow = fast = A[0]
+    while True:
+        slow = A[slow]
+        fast = A[A[fast]]
+        if slow == fast:
+            break
+    slow = A[0]
+    while slow != fast:
+        slow = A[slow]
+        fast = A[fast]
+    return slow
+
+def bitset_duplicates(A, lo, hi):
+    """
+    Return list of repeated values of iterable A of integers in lo..hi,
+    in order of their second occurrence.
+
+    Uses two bitsets of (hi - lo + 1) bits, so memory is fixed by the
+    range rather than by the number of distinct values.
+    """
+    size = hi - lo + 1
+    seen = bytearray((size + 7) // 8)
+    reported = bytearray((size + 7) // 8)
+    result = []
+    for value in A:
+        k = value - lo
+        if not 0 <= k < size:
+            raise ValueError("value {0} outside {1}..{2}".format(value, lo, hi))
+        byte, bit = k >> 3, 1 << (k & 7)
+        if seen[byte] & bit:
+            if not reported[byte] & bit:
+                reported[byte] |= bit
+                result.append(value)
+        else:
+            seen[byte] |= bit
+    return result
+
+_MASK64 = (1 << 64) - 1
+
+def _mix(value, salt):
+    """
+    Return 64-bit hash of integer value (splitmix64 finalizer), varied by salt.
+    """
+    x = (value + salt * 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+class BloomFilter:
+    """
+    Probabilistic set of integers: membership tests have no false
+    negatives, and false positives at about error_rate while holding
+    up to capacity elements.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        """
+        Create empty filter sized for capacity elements.
+        """
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate in (0, 1)")
+        self._size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def _positions(self, value):
+        """
+        Generate bit positions for value by double hashing.
+        """
+        h1 = _mix(value, 0)
+        h2 = _mix(value, 1) | 1
+        for i in range(self._hashes):
+            yield (h1 + i * h2) % self._size
+
+    def add(self, value):
+        """
+        Add integer value to the filter.
+        """
+        for p in self._positions(value):
+            self._bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, value):
+        """
+        Return True if value was probably added, False if it certainly was not.
+        """
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(value))
+
+def read_ints(path):
+    """
+    Generate the whitespace-separated integers of a text file, line by line.
+    """
+    with open(path) as f:
+        for line in f:
+            for token in line.split():
+                yield int(token)
+
+def probable_duplicates(ints, capacity, error_rate=0.01):
+    """
+    Generate, in one pass, values of ints that were probably seen before.
+
+    Every repeated value is reported (once, at its second occurrence);
+    a value seen only once is wrongly reported with probability about
+    error_rate. Memory is the Bloom filter for capacity values plus the
+    set of values already reported.
+    """
+    seen = BloomFilter(capacity, error_rate)
+    reported = set()
+    for value in ints:
+        if value in seen:
+            if value not in reported:
+                reported.add(value)
+                yield value
+        else:
+            seen.add(value)
+
+# estimated bytes per distinct value while counting a bucket in memory
+_COUNT_ENTRY_BYTES = 100
+
+def external_duplicates(ints, memory_limit=64 * 2**20, buckets=64, tmpdir=None):
+    """
+    Generate (value, count) for every value repeated in an iterable of
+    int64 values too large to hold in memory.
+
+    Values are hash-partitioned into buckets spilled to temporary files,
+    and each bucket is then counted in memory; a bucket too large for
+    memory_limit bytes is partitioned again with another hash. Output is
+    grouped by bucket, not in input order.
+    """
+    with tempfile.TemporaryDirectory(dir=tmpdir) as tmp:
+        paths = _partition(iter(ints), tmp, buckets, memory_limit, 0)
+        for path in paths:
+            yield from _bucket_duplicates(path, tmp, buckets, memory_limit, 1)
+
+def _partition(values, tmp, buckets, memory_limit, level):
+    """
+    Spill values into buckets files named after level; return their paths.
+    """
+    prefix = os.path.join(tmp, "{0}-{1}".format(level, os.urandom(4).hex()))
+    paths = ["{0}-{1}".format(prefix, b) for b in range(buckets)]
+    pending = [array.array("q") for _ in range(buckets)]
+    flush_at = max(1024, memory_limit // (16 * buckets))
+    files = [open(path, "wb") for path in paths]
+    try:
+        for value in values:
+            b = _mix(value, level + 2) % buckets
+            pending[b].append(value)
+            if len(pending[b]) >= flush_at:
+                pending[b].tofile(files[b])
+                pending[b] = array.array("q")
+        for b in range(buckets):
+            pending[b].tofile(files[b])
+    finally:
+        for f in files:
+            f.close()
+    return paths
+
+def _read_spill(path, block=1 << 16):
+    """
+    Generate arrays of the int64 values stored in a spill file, block by block.
+    """
+    with open(path, "rb") as f:
+        while True:
+            data = array.array("q")
+            data.frombytes(f.read(block * data.itemsize))
+            if not data:
+                return
+            yield data
+
+def _bucket_duplicates(path, tmp, buckets, memory_limit, level):
+    """
+    Generate (value, count) of repeated values in one spill file, deleting it.
+
+    The bucket is counted in memory unless it holds too many distinct
+    values for memory_limit, and only then partitioned again: copies of
+    one value can never be split, so a hot key alone does not recurse.
+    """
+    max_distinct = max(1, memory_limit // _COUNT_ENTRY_BYTES)
+    counts = collections.Counter()
+    for data in _read_spill(path):
+        counts.update(data)
+        if len(counts) > max_distinct and level <= 8:
+            break
+    else:
+        os.remove(path)
+        for value, c in counts.items():
+            if c > 1:
+                yield value, c
+        return
+    del counts
+    values = itertools.chain.from_iterable(_read_spill(path))
+    paths = _partition(values, tmp, buckets, memory_limit, level)
+    os.remove(path)
+    for sub in paths:
+        yield from _bucket_duplicates(sub, tmp, buckets, memory_limit, level + 1)
+
+def parallel_duplicates(A, workers=None, block=1 << 20):
+    """
+    Return dict mapping each value repeated in sequence A of int64
+    values to its count, sorted by value, using a pool of processes.
+
+    A is packed once into a multiprocessing.shared_memory int64 buffer
+    that every worker maps without pickling; worker p counts (with
+    np.unique, block by block) only the values hashing to partition p,
+    so the partial results are disjoint and merge by concatenation.
+    Requires NumPy.
+    """
+    if np is None:
+        raise ImportError("parallel_duplicates requires NumPy")
+    n = len(A)
+    if n == 0:
+        return {}
+    workers = workers or os.cpu_count() or 1
+    shm = shared_memory.SharedMemory(create=True, size=n * 8)
+    try:
+        # fill the segment block by block, with no private copy of A
+        values = np.ndarray((n,), np.int64, buffer=shm.buf)
+        for lo in range(0, n, block):
+            values[lo:lo + block] = A[lo:lo + block]
+        del values
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            parts = pool.map(_partition_duplicates,
+                             itertools.repeat(shm.name), itertools.repeat(n),
+                             range(workers), itertools.repeat(workers),
+                             itertools.repeat(block))
+            result = {}
+            for part in parts:
+                result.update(part)
+    finally:
+        shm.close()
+        shm.unlink()
+    return dict(sorted(result.items()))
+
+def _partition_duplicates(name, n, partition, partitions, block):
+    """
+    Return repeated (value, count) pairs of one hash partition of the
+    shared int64 buffer called name (process pool worker).
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        data = np.ndarray((n,), np.int64, buffer=shm.buf)
+        pieces = []
+        for lo in range(0, n, block):
+            chunk = data[lo:lo + block]
+            h = (chunk.view(np.uint64) * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(32)
+            pieces.append(chunk[h % np.uint64(partitions) == partition])
+        del data, chunk
+        mine = np.concatenate(pieces) if pieces else np.empty(0, np.int64)
+        unique, counts = np.unique(mine, return_counts=True)
+        repeated = counts > 1
+        return dict(zip(unique[repeated].tolist(), counts[repeated].tolist()))
+    finally:
+        shm.close()
+
+def benchmark_parallel_duplicates(n=10**7, max_workers=None):
+    """
+    Report seconds taken by parallel_duplicates for 1..max_workers
+    processes, next to repeated_counts.
+    """
+    rng = random.Random(20)
+    data = array.array("q", (rng.randrange(n) for _ in range(n)))
+    print("repeated_counts:   {0:8.3f} s".format(_time(lambda: repeated_counts(data), repeat=1)))
+    max_workers = max_workers or os.cpu_count() or 1
+    for workers in range(1, max_workers + 1):
+        elapsed = _time(lambda: parallel_duplicates(data, workers), repeat=1)
+        print("workers={0:3d}:       {1:8.3f} s".format(workers, elapsed))
+
+def benchmark_duplicates(n=10**6):
+    """
+    Report seconds taken by each duplicate finder against the former
+    sort-based repeatedIntegers (run on a copy, returning all repeats).
+    """
+    rng = random.Random(18)
+    data = [rng.randrange(n) for _ in range(n)]
+    pigeonhole = list(range(1, n)) + [rng.randrange(1, n)]
+    rng.shuffle(pigeonhole)
+
+    def sort_based(A):
+        B = sorted(A)
+        return [B[i] for i in range(1, len(B))
+                if B[i] == B[i-1] and (i == 1 or B[i] != B[i-2])]
+
+    cases = [("sort-based", lambda: sort_based(data)),
+             ("repeated_counts", lambda: repeated_counts(data)),
+             ("iter_duplicates", lambda: list(iter_duplicates(data))),
+             ("bitset_duplicates", lambda: bitset_duplicates(data, 0, n - 1)),
+             ("sort-based (1..n)", lambda: sort_based(pigeonhole)),
+             ("find_duplicate_floyd", lambda: find_duplicate_floyd(pigeonhole))]
+    for label, fn in cases:
+        print("{0:22s} n={1}: {2:8.4f} s".format(label, n, _time(fn, repeat=1)))
+
 def repeatedIntegers(A):
     """
-    Assume that list only contains 1 repeated integer
-    Returns a list of integers that are repeated in array A.
+    Returns a list of integers that are repeated in array A,
+    in order of first occurrence. A is not modified.
 
     A.append(value) => O(1)
     value in storedList => O(k+1)
@@ -270,30 +2272,51 @@ def repeatedIntegers(A):
     A.sort() => O(nlogn)
     A[i] == A[i-1] => O(n)
 
+    Counter(A) => O(n) expected
+
     """
     if not isinstance(A, list):
         raise TypeError("input must be of type list")
 
+    ######
+    # OPTION 3
+    # Returns list of repeated integers
+    # single pass over A with a hash table; does not sort A in place
+    ######
+
+    # total time
+    # O(n) + O(n) => O(n)
+
+    # type check time
+    # O(n)
+    for value in A:
+        if not isinstance(value, int):
+            raise TypeError("element must be of type int")
+
+    # counting and filter time
+    # O(n)
+    return list(repeated_counts(A))
+
     ######
     # OPTION 2
     # Returns first repeated integer
     # works if list only contains 1 repeated integer
     ######
 
-    # total time
-    # O(nlogn) + O(n) => O(n)
+    # # total time
+    # # O(nlogn) + O(n) => O(n)
 
-    # sort time 
-    # O(nlogn)
-    A.sort()
+    # # sort time 
+    # # O(nlogn)
+    # A.sort()
 
-    # for loop time (inclusive of loop body)
-    # O(n)
-    for i in range(1,len(A)):
-        if not isinstance(A[i], int):
-            raise TypeError("element must be of type int")
-        if A[i] == A[i-1]:
-            return A[1]
+    # # for loop time (inclusive of loop body)
+    # # O(n)
+    # for i in range(1,len(A)):
+    #     if not isinstance(A[i], int):
+    #         raise TypeError("element must be of type int")
+    #     if A[i] == A[i-1]:
+    #         return A[1]
 
     ######
     # OPTION 1
@@ -330,6 +2353,9 @@ def repeatedIntegers(A):
         
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(caesar_main())
+
     print("Chapter 5")
 
     nonRepeatedList = [i for i in range(10)]
@@ -350,6 +2376,23 @@ if __name__ == "__main__":
     
 
 
+    # benchmark_dynamic_array_memory()
+    # benchmark_dynamic_array_bulk()
+    # benchmark_growth_policies()
+    # benchmark_dynamic_array_moves()
+    # benchmark_game_entry_memory()
+    # benchmark_scoreboard_ingest()
+    # benchmark_parallel_scoreboard()
+    # benchmark_sorts()
+    # benchmark_caesar_stream()
+    # benchmark_caesar_many()
+    # benchmark_caesar_crack()
+    # benchmark_tictactoe()
+    # benchmark_tictactoe_solver()
+    # benchmark_tictactoe_simulation()
+    # benchmark_duplicates()
+    # benchmark_parallel_duplicates()
+
     # print("Caesar Cipher")
     # cipher = CaesarCipher(3)
     # message = "THE EAGLE IS IN PLAY; MEET AT JOE'S."